@@ -1,5 +1,7 @@
 import streamlit as st
 import sqlite3
+import os
+import tempfile
 import pandas as pd
 import numpy as np
 from nba_api.stats.static import players, teams
@@ -7,11 +9,17 @@ from nba_api.stats.endpoints import playergamelog, commonteamroster, PlayerGameL
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
 from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
 import xgboost as xgb
+from nba_kernels import build_features
 import time
+import functools
+from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Parallel, delayed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from requests.exceptions import ReadTimeout, ConnectionError
-from fuzzywuzzy import process
+from rapidfuzz import process, fuzz
 import unidecode
 import logging
 
@@ -35,16 +43,33 @@ st.markdown("""
 # Title
 st.markdown('<p class="big-font">NBA Game Predictions 🏀</p>', unsafe_allow_html=True)
 
+# Model inputs, in the column order of the matrix nba_kernels.build_features returns
+FEATURES = ['Rolling_Avg_PTS', 'Rolling_Avg_REB', 'Rolling_Avg_AST', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']
+
+# SQLite database holding historical game logs for career averages
+DB_PATH = 'nba_game_logs.db'
+
+# On-disk Parquet cache for fetched game logs, refreshed once a day
+CACHE_DIR = 'cache'
+CACHE_TTL = 24 * 60 * 60
+
 # Common Functions
+@st.cache_resource
+def _team_abbr_list():
+    return tuple(team['abbreviation'] for team in teams.get_teams())
+
+@st.cache_resource
+def _team_abbr_to_id():
+    return {team['abbreviation']: team['id'] for team in teams.get_teams()}
+
 def get_team_roster(team_abbreviation, retries=3, delay=5):
     for attempt in range(retries):
         try:
-            team_info = teams.find_team_by_abbreviation(team_abbreviation)
-            if not team_info:
+            team_id = _team_abbr_to_id().get(team_abbreviation)
+            if team_id is None:
                 st.error(f"Team '{team_abbreviation}' not found.")
                 return []
 
-            team_id = team_info['id']
             roster = commonteamroster.CommonTeamRoster(team_id=team_id, timeout=60).get_data_frames()[0]
             return roster[['PLAYER_ID', 'PLAYER']].values.tolist()  # Return player IDs and names
         except ReadTimeout:
@@ -58,121 +83,199 @@ def get_team_roster(team_abbreviation, retries=3, delay=5):
             st.error(f"Error getting roster: {e}")
             return []
 
-@st.cache_data
-def get_player_data(player_name, season='2024-25', max_retries=3):
+@st.cache_resource
+def _player_index():
+    # Players sharing a normalized name resolve to the first one listed, like
+    # players.find_players_by_full_name(...)[0] did
+    player_lookup = {}
+    for player in players.get_players():
+        player_lookup.setdefault(unidecode.unidecode(player['full_name']).lower(), player)
+    return player_lookup, list(player_lookup)
+
+def _cached_gamelog(player_id, season):
+    path = os.path.join(CACHE_DIR, f'{player_id}_{season}.parquet')
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < CACHE_TTL:
+        try:
+            return pd.read_parquet(path)
+        except (OSError, ValueError) as e:
+            # Unreadable cache entry (e.g. left behind by a crash); drop it and refetch
+            logging.warning(f"Discarding unreadable cache file {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    game_log = playergamelog.PlayerGameLog(
+        player_id=player_id,
+        season=season,
+        timeout=120
+    ).get_data_frames()[0]
+
+    # Write to a temp file and rename it into place so readers never see a partial file
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.parquet.tmp')
+    os.close(fd)
+    try:
+        game_log.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.warning(f"Failed to cache game log for {player_id} ({season}): {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return game_log
+
+@st.cache_data(show_spinner=False)
+def get_player_data(player_name, season='2024-25', max_retries=3, player_id=None):
+    # Runs on roster worker threads, so it must not write to the page. Failures are
+    # raised (and therefore not cached) for the caller to report.
     for attempt in range(max_retries):
         try:
-            all_players = players.get_players()
-            player_names = [player['full_name'] for player in all_players]
+            # Roster callers already know the player ID; only resolve bare names
+            if player_id is None:
+                player_lookup, player_names = _player_index()
 
-            normalized_player_name = unidecode.unidecode(player_name)
-            matched_name, score = process.extractOne(normalized_player_name, player_names)
+                normalized_player_name = unidecode.unidecode(player_name).lower()
+                player = player_lookup.get(normalized_player_name)
 
-            if score < 80:
-                st.warning(f"Player '{player_name}' not found. Did you mean '{matched_name}'?")
-                player_name = matched_name
+                if player is None:
+                    match = process.extractOne(normalized_player_name, player_names, scorer=fuzz.WRatio, score_cutoff=80)
+                    if match is None:
+                        raise LookupError(f"Player '{player_name}' not found.")
+                    player = player_lookup[match[0]]
 
-            player_dict = players.find_players_by_full_name(player_name)
-            if not player_dict:
-                st.error(f"Player '{player_name}' not found.")
-                return None
-            
-            player_id = player_dict[0]['id']
+                player_id = player['id']
             
-            current_season = playergamelog.PlayerGameLog(
-                player_id=player_id, 
-                season=season,
-                timeout=120
-            ).get_data_frames()[0]
-
-            time.sleep(1)
-
-            previous_season = playergamelog.PlayerGameLog(
-                player_id=player_id, 
-                season='2023-24',
-                timeout=120
-            ).get_data_frames()[0]
+            # The two seasons are independent requests, so fetch them concurrently
+            with ThreadPoolExecutor(2) as executor:
+                current_future = executor.submit(_cached_gamelog, player_id, season)
+                previous_future = executor.submit(_cached_gamelog, player_id, '2023-24')
+                current_season, previous_season = current_future.result(), previous_future.result()
             
-            combined_data = pd.concat([current_season, previous_season], ignore_index=True)
-
-            if combined_data.shape[0] < 5:
-                st.warning(f"Insufficient data for {player_name}. Only {combined_data.shape[0]} games found.")
-                return None
-            
-            return combined_data
+            return pd.concat([current_season, previous_season], ignore_index=True)
             
-        except (ReadTimeout, ConnectionError) as e:
+        except (ReadTimeout, ConnectionError):
             if attempt < max_retries - 1:
                 time.sleep(2)
             else:
-                st.error(f"Failed to fetch data for {player_name} after {max_retries} attempts")
-                return None
+                raise
+
+def _fetch_player_data(ctx, player_id, player_name):
+    # Worker threads need the script context for st.cache_data. Errors are returned
+    # rather than raised so one failing player can't abort the whole roster fetch.
+    add_script_run_ctx(threading.current_thread(), ctx)
+    try:
+        return get_player_data(player_name, player_id=player_id), None
+    except LookupError as e:
+        return None, str(e)
+    except Exception as e:
+        return None, f"Failed to fetch data for {player_name}: {e}"
+
+@functools.lru_cache(maxsize=None)
+def _parse_date(date_str):
+    # Game dates repeat across every player's log, so each string is parsed only once
+    return datetime.strptime(date_str, '%b %d, %Y')
 
 def preprocess_game_log(game_log):
-    game_log['GAME_DATE'] = pd.to_datetime(game_log['GAME_DATE'], format='%b %d, %Y')  
+    """
+    Clean a raw game log and derive the model features.
+
+    :param game_log: Combined game log from get_player_data.
+    :return: The processed log sorted by date, its (N, 7) FEATURES matrix and the per-feature means.
+    """
+    game_log['GAME_DATE'] = pd.to_datetime(game_log['GAME_DATE'].map(_parse_date))
     game_log['HOME_AWAY'] = np.where(game_log['MATCHUP'].str.contains('@'), 'Away', 'Home')
     
-    for col in ['PTS', 'AST', 'REB', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'TOV', 'PF', 'MIN']:
-        game_log[col] = game_log[col].astype(float)
+    # float32 is plenty for box-score stats and halves memory traffic downstream.
+    # Keep them as one (stat, game) array: each row is a contiguous kernel input and
+    # the NaN check below needs no extra frame.
+    stat_cols = ['PTS', 'AST', 'REB', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'TOV', 'PF', 'MIN']
+    stats = np.ascontiguousarray(game_log[stat_cols].to_numpy(dtype=np.float32).T)
+    game_log[stat_cols] = stats.T
 
-    game_log['Rolling_Avg_PTS'] = game_log['PTS'].rolling(window=5).mean()
-    game_log['Rolling_Avg_REB'] = game_log['REB'].rolling(window=5).mean()
-    game_log['Rolling_Avg_AST'] = game_log['AST'].rolling(window=5).mean()
+    stat_rows = dict(zip(stat_cols, stats))
+    features = build_features(*(
+        stat_rows[col] for col in ['PTS', 'AST', 'REB', 'MIN', 'FGM', 'FGA', 'FTM', 'FTA', 'FG3M', 'FG3A']
+    ))
 
-    game_log['AVG_PTS'] = game_log['PTS'].expanding().mean()
-    game_log['AVG_AST'] = game_log['AST'].expanding().mean()
-    game_log['AVG_REB'] = game_log['REB'].expanding().mean()
-    game_log['MINUTES_PLAYED'] = game_log['MIN']
-    game_log['FGM_PCT'] = game_log['FGM'] / game_log['FGA']
-    game_log['FTM_PCT'] = game_log['FTM'] / game_log['FTA']
-    game_log['FG3M_PCT'] = game_log['FG3M'] / game_log['FG3A']
+    # Sort by date and drop games with missing stats or features with a single take
+    order = np.argsort(game_log['GAME_DATE'].to_numpy(), kind='stable')
+    complete = ~(np.isnan(features).any(axis=1) | np.isnan(stats).any(axis=0))
+    rows = order[complete[order]]
+    game_log = game_log.take(rows)
 
-    game_log = game_log.sort_values('GAME_DATE', ascending=True)
-    game_log.dropna(inplace=True)
+    features = features[rows]
+    return game_log, features, features.mean(axis=0)
 
-    return game_log
+@st.cache_resource
+def _conn(db_path):
+    # One connection per database for the whole process instead of one per query.
+    # It is shared by every session's script thread, so callers must hold the lock.
+    # A missing database or game_logs table raises, so it is never cached.
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Game log database '{db_path}' not found")
 
-def get_career_avg_vs_opponent(player_id, opponent_team_id, db_path):
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'game_logs'"
+    ).fetchone()
+    if not has_table:
+        conn.close()
+        raise sqlite3.OperationalError(f"no such table: game_logs in '{db_path}'")
+
+    try:
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_pid ON game_logs(player_id)')
+    except sqlite3.OperationalError as e:
+        # The index is only an optimization; read-only or locked databases still work
+        logging.warning(f"Could not create player_id index on {db_path}: {e}")
+    return conn, threading.Lock()
+
+def get_career_avgs_vs_opponent(player_ids, opponent_team_id, db_path=DB_PATH):
     """
-    Get the career average points of a player against a specific opponent.
+    Get the career average points of several players against a specific opponent.
     
-    :param player_id: The player's ID.
+    :param player_ids: The players' IDs.
     :param opponent_team_id: The opponent team's ID.
     :param db_path: Path to the SQLite database.
-    :return: Average points scored against the opponent, or None if no data exists.
+    :return: Dict mapping player ID to average points against the opponent; players without data are omitted.
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Query to calculate the average points against the specific opponent
+    # The database is optional; without it there are simply no career averages
+    if not player_ids or not os.path.exists(db_path):
+        return {}
+
+    # One grouped query for the whole roster instead of one round-trip per player
     query = """
-    SELECT AVG(PTS) as avg_pts
+    SELECT player_id, AVG(PTS) as avg_pts
     FROM game_logs
-    WHERE player_id = ?
-      AND MATCHUP LIKE '%' || ? || '%'
-    """
-    
-    cursor.execute(query, (player_id, opponent_team_id))
-    result = cursor.fetchone()
+    WHERE player_id IN ({})
+      AND MATCHUP LIKE ?
+    GROUP BY player_id
+    """.format(','.join('?' * len(player_ids)))
     
-    conn.close()
-    
-    # Return the average points if it exists, otherwise None
-    return result[0] if result and result[0] is not None else None
+    conn, lock = _conn(db_path)
+    with lock:
+        df = pd.read_sql(query, conn, params=[*player_ids, f'%{opponent_team_id}%'])
+    # Normalize keys to int so lookups by roster ID hit even if player_id is stored as TEXT
+    return dict(zip(df['player_id'].astype(int), df['avg_pts']))
 
 # Add this function definition above the main function
-def predict_with_model(model, game_log, target_col):
-    features = game_log[['Rolling_Avg_PTS', 'Rolling_Avg_REB', 'Rolling_Avg_AST', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']]
-    return model.predict(features.mean().values.reshape(1, -1))
+def predict_with_model(model, model_type, feature_means):
+    # One batched predict for the whole roster instead of one 1x7 call per player
+    if model_type == "XGBoost":
+        # hist bins inputs internally, so float32 is all the precision the booster uses
+        return model.get_booster().predict(xgb.DMatrix(feature_means.astype(np.float32, copy=False)))
+    elif model_type == "Polynomial Regression":
+        return model.predict(_poly2(feature_means))
+    return model.predict(feature_means)
+
+def split_features(features, target):
+    # Computed once per team and shared by whichever model is trained
+    return train_test_split(features, target, test_size=0.2, random_state=42)
 
 # Add this function definition above the main function
-def train_xgboost(game_log, target_col):
-    features = game_log[['Rolling_Avg_PTS', 'Rolling_Avg_REB', 'Rolling_Avg_AST', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']]
-    target = game_log[target_col]
-    
-    X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.2, random_state=42)
-    
-    model = xgb.XGBRegressor()
+def train_xgboost(X_train, X_test, y_train, y_test, target_col):
+    model = xgb.XGBRegressor(
+        tree_method='hist', grow_policy='lossguide', n_jobs=-1, n_estimators=100, max_depth=4, max_bin=64
+    )
     model.fit(X_train, y_train)
     
     y_pred = model.predict(X_test)
@@ -181,33 +284,31 @@ def train_xgboost(game_log, target_col):
 
     return model, mse
 
+def _poly2(X):
+    # Degree-2 polynomial expansion in the same column order as PolynomialFeatures(degree=2):
+    # bias, linear terms, then x_i * x_j for i <= j. Always float64: the squared and
+    # cross terms are large and collinear, too much for a float32 least-squares fit.
+    n, p = X.shape
+    out = np.empty((n, 1 + p + p * (p + 1) // 2), dtype=np.float64)
+    out[:, 0] = 1
+    out[:, 1:1 + p] = X
+    iu, ju = np.triu_indices(p)
+    out[:, 1 + p:] = X[:, iu] * X[:, ju]
+    return out
+
 # Add this function definition above the main function
-def train_polynomial_regression(game_log, target_col):
-    from sklearn.preprocessing import PolynomialFeatures
-    features = game_log[['Rolling_Avg_PTS', 'Rolling_Avg_REB', 'Rolling_Avg_AST', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']]
-    target = game_log[target_col]
-    
-    poly = PolynomialFeatures(degree=2)
-    X_poly = poly.fit_transform(features)
-    
-    X_train, X_test, y_train, y_test = train_test_split(X_poly, target, test_size=0.2, random_state=42)
-    
+def train_polynomial_regression(X_train, X_test, y_train, y_test, target_col):
     model = LinearRegression()
-    model.fit(X_train, y_train)
+    model.fit(_poly2(X_train), y_train)
     
-    y_pred = model.predict(X_test)
+    y_pred = model.predict(_poly2(X_test))
     mse = mean_squared_error(y_test, y_pred)
     st.write(f'Test MSE ({target_col} - Polynomial Regression): {mse:.2f} (± {np.sqrt(mse):.2f})')
 
-    return model, poly, mse
+    return model, mse
 
 
-def train_linear_regression(game_log, target_col):
-    features = game_log[['Rolling_Avg_PTS', 'Rolling_Avg_REB', 'Rolling_Avg_AST', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']]
-    target = game_log[target_col]
-    
-    X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.2, random_state=42)
-    
+def train_linear_regression(X_train, X_test, y_train, y_test, target_col):
     model = LinearRegression()
     model.fit(X_train, y_train)
     
@@ -217,56 +318,127 @@ def train_linear_regression(game_log, target_col):
 
     return model, mse
 
+def load_team_logs(roster):
+    """
+    Fetch and preprocess the game logs of every player on a team's roster.
+
+    :param roster: List of (player_id, player_name) pairs from get_team_roster.
+    :return: List of (player_id, player_name, processed_log, features, feature_means) tuples.
+    """
+    # Roster fetches are network-bound, so fan them out over threads
+    ctx = get_script_run_ctx()
+    results = Parallel(n_jobs=8, backend='threading')(
+        delayed(_fetch_player_data)(ctx, player_id, player_name) for player_id, player_name in roster
+    )
+
+    # Report fetch problems from the script thread, in roster order
+    player_logs = []
+    for (player_id, player_name), (game_log, error) in zip(roster, results):
+        if error is not None:
+            st.error(error)
+            continue
+
+        if len(game_log) < 5:
+            st.warning(f"Insufficient data for {player_name}. Only {len(game_log)} games found.")
+            continue
+
+        try:
+            processed_log, features, feature_means = preprocess_game_log(game_log)
+        except Exception as e:
+            st.error(f"Error processing {player_name}: {e}")
+            continue
+
+        if processed_log.empty:
+            st.warning(f"Insufficient data for {player_name}")
+            continue
+        player_logs.append((player_id, player_name, processed_log, features, feature_means))
+
+    return player_logs
+
+def predict_team(player_logs, model_type, target_col):
+    """
+    Fit a single model on the pooled logs of a team and predict every player at once.
+
+    :param player_logs: List of tuples as returned by load_team_logs.
+    :param model_type: One of "XGBoost", "Linear Regression", "Polynomial Regression".
+    :param target_col: Column to predict.
+    :return: Array of predictions, one per entry in player_logs.
+    """
+    features = np.vstack([feats for _, _, _, feats, _ in player_logs])
+    target = np.concatenate([log[target_col].to_numpy() for _, _, log, _, _ in player_logs])
+    feature_means = np.vstack([means for _, _, _, _, means in player_logs])
+    if model_type != "XGBoost":
+        # float32 is only for storage and XGBoost; the least-squares fits run in float64
+        features, target, feature_means = (a.astype(np.float64) for a in (features, target, feature_means))
+    splits = split_features(features, target)
+
+    if model_type == "XGBoost":
+        model, mse = train_xgboost(*splits, target_col)
+    elif model_type == "Polynomial Regression":
+        model, mse = train_polynomial_regression(*splits, target_col)
+    else:
+        model, mse = train_linear_regression(*splits, target_col)
+
+    return predict_with_model(model, model_type, feature_means)
+
 def main():
     st.sidebar.title("Navigation")
     page = st.sidebar.radio("Select Prediction Type", ["Points", "Assists", "Rebounds", "Three-Point Simulation"])
 
-    home_team = st.selectbox("Select Home Team", options=[team['abbreviation'] for team in teams.get_teams()])
-    away_team = st.selectbox("Select Away Team", options=[team['abbreviation'] for team in teams.get_teams()])
+    home_team = st.selectbox("Select Home Team", options=_team_abbr_list())
+    away_team = st.selectbox("Select Away Team", options=_team_abbr_list())
     
     model_type = st.selectbox("Select Model Type", ["XGBoost", "Linear Regression", "Polynomial Regression"])
 
     if st.button("Generate Predictions"):
         with st.spinner("Generating predictions..."):
+            # Rosters, game logs and model predictions don't depend on the opponent,
+            # so build them the first time a team comes up and reuse them afterwards.
+            # Loading happens under the team's subheader so its warnings and MSE stay there.
+            team_results = {}
             teams_to_analyze = [(home_team, away_team), (away_team, home_team)]
             for team, opponent in teams_to_analyze:
-                roster = get_team_roster(team)
-                st.subheader(f"Analyzing {len(roster)} players from {team} against {opponent}...")
+                if team in team_results:
+                    roster, player_logs, preds = team_results[team]
+                    st.subheader(f"Analyzing {len(roster)} players from {team} against {opponent}...")
+                else:
+                    roster = get_team_roster(team)
+                    st.subheader(f"Analyzing {len(roster)} players from {team} against {opponent}...")
+
+                    player_logs = load_team_logs(roster)
+                    preds = None
+                    if not player_logs:
+                        st.warning(f"No usable player data for {team}")
+                    else:
+                        try:
+                            preds = predict_team(player_logs, model_type, 'PTS')
+                        except Exception as e:
+                            st.error(f"Error training model for {team}: {e}")
+                    team_results[team] = (roster, player_logs, preds)
+
+                if preds is None:
+                    continue
                 
                 predictions = {}
                 total_predicted_score = 0
-                opponent_team_id = teams.find_team_by_abbreviation(opponent)['id']  # Get opponent team ID
-                for player_id, player_name in roster:
-                    game_log = get_player_data(player_name)
-                    if game_log is None or len(game_log) < 5:
-                        st.warning(f"Insufficient data for {player_name}")
-                        continue
-                        
-                    try:
-                        processed_log = preprocess_game_log(game_log)
-                        if model_type == "XGBoost":
-                            model, mse = train_xgboost(processed_log, 'PTS')
-                            pred = model.predict(processed_log[['FTA', 'FT_PCT', 'TOV', 'PF', 'FGM', 'FGA', 'FTM', 'FG3M', 'AVG_PTS', 'AVG_AST', 'AVG_REB', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']].mean().values.reshape(1, -1))
-                        elif model_type == "Polynomial Regression":
-                            model, poly, mse = train_polynomial_regression(processed_log, 'PTS')
-                            pred = model.predict(poly.transform(processed_log[['FTA', 'FT_PCT', 'TOV', 'PF', 'FGM', 'FGA', 'FTM', 'FG3M', 'AVG_PTS', 'AVG_AST', 'AVG_REB', 'MINUTES_PLAYED', 'FGM_PCT', 'FTM_PCT', 'FG3M_PCT']].mean().values.reshape(1, -1)))
-                        else:
-                            model, mse = train_linear_regression(processed_log, 'PTS')
-                            pred = predict_with_model(model, processed_log, 'PTS')
-                        
-                        if pred is not None:
-                            predictions[player_name] = pred[0]
-                            total_predicted_score += pred[0]
-                            
-                            # Get career average points against the opposing team
-                            career_avg = get_career_avg_vs_opponent(player_id, opponent_team_id)
-                            if career_avg is not None:
-                                st.write(f"{player_name}: {pred[0]:.1f} points (Career Avg vs {opponent}: {career_avg:.1f})")
-                            else:
-                                st.write(f"{player_name}: {pred[0]:.1f} points (Career Avg vs {opponent}: No data available)")
-                    except Exception as e:
-                        st.error(f"Error processing {player_name}: {e}")
-                        continue
+                opponent_team_id = _team_abbr_to_id()[opponent]  # Get opponent team ID
+
+                try:
+                    # Get career average points against the opposing team for the whole roster
+                    career_avgs = get_career_avgs_vs_opponent([player_id for player_id, *_ in player_logs], opponent_team_id)
+                except Exception as e:
+                    st.error(f"Error getting career averages for {team}: {e}")
+                    career_avgs = {}
+
+                for (player_id, player_name, _, _, _), pred in zip(player_logs, preds):
+                    predictions[player_name] = pred
+                    total_predicted_score += pred
+
+                    career_avg = career_avgs.get(player_id)
+                    if career_avg is not None:
+                        st.write(f"{player_name}: {pred:.1f} points (Career Avg vs {opponent}: {career_avg:.1f})")
+                    else:
+                        st.write(f"{player_name}: {pred:.1f} points (Career Avg vs {opponent}: No data available)")
                 
                 st.write(f"\n{'='*50}")
                 st.write(f"{model_type} Predictions for {team} against {opponent}:")
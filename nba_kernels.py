@@ -0,0 +1,64 @@
+"""
+Numba kernels for NBA Analyzer's game-log preprocessing.
+
+These live in their own module because Streamlit re-executes the app script on every
+widget interaction. Kept here, the compiled dispatchers are imported once and stay in
+sys.modules for the life of the process.
+"""
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def rolling_expanding(pts, ast, reb, window=5):
+    # Rolling-window and expanding means for PTS/AST/REB in one streaming pass.
+    # Mirrors pandas' online kernel: add the incoming value, subtract the outgoing
+    # one and only emit a rolling mean once `window` non-NaN observations are seen.
+    series = (pts, ast, reb)
+    n = pts.shape[0]
+    rolling = np.full((3, n), np.nan, dtype=pts.dtype)
+    expanding = np.full((3, n), np.nan, dtype=pts.dtype)
+    for j in range(3):
+        values = series[j]
+        roll_sum = 0.0
+        roll_nobs = np.int64(0)
+        exp_sum = 0.0
+        exp_nobs = np.int64(0)
+        for i in range(n):
+            val = values[i]
+            if not np.isnan(val):
+                roll_sum += val
+                roll_nobs += 1
+                exp_sum += val
+                exp_nobs += 1
+            if i >= window:
+                prev = values[i - window]
+                if not np.isnan(prev):
+                    roll_sum -= prev
+                    roll_nobs -= 1
+            if roll_nobs >= window:
+                rolling[j, i] = roll_sum / roll_nobs
+            if exp_nobs > 0:
+                expanding[j, i] = exp_sum / exp_nobs
+    return rolling[0], rolling[1], rolling[2], expanding[0], expanding[1], expanding[2]
+
+@njit(cache=True, error_model='numpy')
+def build_features(pts, ast, reb, minutes, fgm, fga, ftm, fta, fg3m, fg3a):
+    # Assemble the FEATURES matrix straight from the raw stat columns, so the model
+    # inputs are materialized exactly once
+    roll_pts, roll_ast, roll_reb, _, _, _ = rolling_expanding(pts, ast, reb)
+    n = pts.shape[0]
+    features = np.empty((n, 7), dtype=pts.dtype)
+    for i in range(n):
+        features[i, 0] = roll_pts[i]
+        features[i, 1] = roll_reb[i]
+        features[i, 2] = roll_ast[i]
+        features[i, 3] = minutes[i]
+        features[i, 4] = fgm[i] / fga[i]
+        features[i, 5] = ftm[i] / fta[i]
+        features[i, 6] = fg3m[i] / fg3a[i]
+    return features
+
+# Compile the kernels (or load them from numba's on-disk cache) once per process at
+# import time, so the first "Generate Predictions" click doesn't pay the JIT cost.
+# Preprocessing feeds them float32 columns, so warm up with that signature.
+build_features(*(np.zeros(10, dtype=np.float32) for _ in range(10)))